@@ -1,16 +1,27 @@
-import os, json
-from typing import List, Dict, Any, Union
+import os, json, math
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Union
 
 import numpy as np
 import pandas as pd
+from pandas.core.internals import BlockManager
+from pandas.core.internals.api import make_block
 from flask import Flask, request, jsonify, redirect
 import joblib
+import orjson
+from numba import njit
 
 # ---------- Needed so unpickler can resolve the FunctionTransformer target ----------
 def flatten_1d(X):
-    """Flatten a (n,1) array/dataframe column to shape (n,)."""
-    import numpy as _np
-    return _np.asarray(X).ravel()
+    """Flatten a (n,1) array/dataframe column to shape (n,).
+
+    Runs inside predict_proba for every text column, so it avoids copies:
+    pandas input goes straight to its backing ndarray, and reshape(-1) on
+    the (n,1) column is a view.
+    """
+    arr = X.to_numpy(copy=False) if hasattr(X, "to_numpy") else np.asarray(X)
+    return arr.reshape(-1)
 
 import sys, types
 sys.modules.setdefault("__main__", types.ModuleType("__main__"))
@@ -25,14 +36,25 @@ META_PATH     = os.path.join(ARTIFACTS_DIR, "metadata.json")
 THR_PATH      = os.path.join(ARTIFACTS_DIR, "threshold.json")
 CLIP_STATS_PATH = os.path.join(ARTIFACTS_DIR, "clip_stats.json")  # optional
 
+# Batches of at least PARALLEL_MIN_ROWS are split across PREDICT_WORKERS threads.
+# Off (1) by default: the XGBoost booster already predicts on every core via
+# OpenMP, so sharding onto N threads runs ~N x cores OpenMP threads. Only
+# enable after benchmarking on the target hardware.
+PREDICT_WORKERS   = int(os.environ.get("PREDICT_WORKERS", "1"))
+PARALLEL_MIN_ROWS = int(os.environ.get("PARALLEL_MIN_ROWS", "256"))
+
 # ----------------------------
 # Load artifacts
 # ----------------------------
 try:
-    clf = joblib.load(PIPELINE_PATH)  # ('pre', pre) + ('model', CalibratedClassifierCV)
+    # mmap: large ndarrays stay in the page cache and are shared across workers
+    clf = joblib.load(PIPELINE_PATH, mmap_mode="r")  # ('pre', pre) + ('model', CalibratedClassifierCV)
 except Exception as e:
     raise RuntimeError(f"Failed to load pipeline at {PIPELINE_PATH}: {e}")
 
+# Column of P(approved) in predict_proba's output
+POS_IDX = int(np.flatnonzero(clf.classes_ == 1)[0])
+
 with open(META_PATH, "r") as f:
     META = json.load(f)
 
@@ -44,12 +66,31 @@ TEXT_COLS:    List[str] = META.get("text_cols", [])
 CAT_COLS:     List[str] = META.get("cat_cols", [])
 NUM_COLS:     List[str] = META.get("num_cols", [])
 
+# Prebuilt column index so per-request reindexing skips re-hashing the labels
+BASE_FEATURES_INDEX = pd.Index(BASE_FEATURES)
+# Single-record frames are two blocks: float64 for NUM_COLS, object otherwise.
+# Each block's columns and their positions in BASE_FEATURES:
+_NUM_COLS_SET = frozenset(NUM_COLS)
+ROW_NUM_COLS = [c for c in BASE_FEATURES if c in _NUM_COLS_SET]
+ROW_OBJ_COLS = [c for c in BASE_FEATURES if c not in _NUM_COLS_SET]
+_ROW_NUM_POS = np.array([i for i, c in enumerate(BASE_FEATURES) if c in _NUM_COLS_SET], dtype=np.intp)
+_ROW_OBJ_POS = np.array([i for i, c in enumerate(BASE_FEATURES) if c not in _NUM_COLS_SET], dtype=np.intp)
+_ROW_AXES = [BASE_FEATURES_INDEX, pd.RangeIndex(1)]
+
 KNOWN_AMT_COLS = [
     "CLAIMED_AMOUNT","SYSTEM_CLAIMED_AMOUNT","PATIENT_SHARE",
     "BILLED_TAX","ACCEPTED_TAX","GROSS_CLAIMED_AMOUNT"
 ]
 amt_for_feats = [c for c in KNOWN_AMT_COLS if c in BASE_FEATURES or c in NUM_COLS]
 
+# Columns that make up a single-record prediction cache key, and the most
+# text (total characters) a cacheable record may carry
+_CACHE_KEY_COLS = frozenset(BASE_FEATURES) | frozenset(KNOWN_AMT_COLS)
+CACHE_KEY_MAX_CHARS = 4096
+
+# Payload key -> training column, kept only when training used the target
+KEY_ALIASES = {src: dst for src, dst in {"SERVICE_DESC": "SRV_DESC"}.items() if dst in BASE_FEATURES}
+
 clip_stats = None
 if os.path.exists(CLIP_STATS_PATH):
     try:
@@ -58,46 +99,185 @@ if os.path.exists(CLIP_STATS_PATH):
     except Exception:
         clip_stats = None  # continue without
 
+# Per-amount upper clip caps in KNOWN_AMT_COLS order (NaN = no cap)
+CLIP_HI = np.array(
+    [float(clip_stats[c]) if clip_stats and c in clip_stats else np.nan for c in KNOWN_AMT_COLS],
+    dtype=np.float64,
+)
+# Same caps for the batch path, +inf when uncapped so clip/log need no branch
+AMT_FEAT_CAPS = [
+    (c, float(clip_stats[c]) if clip_stats and c in clip_stats else np.inf) for c in amt_for_feats
+]
+
+# Output layout of _engineer_row: (feature name, raw columns that must be supplied)
+ROW_FEATURES = [
+    ("PATIENT_SHARE_PCT",       ("PATIENT_SHARE", "CLAIMED_AMOUNT")),
+    ("TAX_ACCEPT_RATIO",        ("ACCEPTED_TAX", "BILLED_TAX")),
+    ("SYSTEM_TO_CLAIMED_RATIO", ("SYSTEM_CLAIMED_AMOUNT", "CLAIMED_AMOUNT")),
+]
+for _suffix in ("_CLIP", "_LOG1P", "_NEG_FLAG", "_ZERO_FLAG"):
+    for _c in KNOWN_AMT_COLS:
+        # amounts the pipeline never saw get no engineered columns
+        ROW_FEATURES.append((f"{_c}{_suffix}", (_c,) if _c in amt_for_feats else None))
+
 # ----------------------------
 # Helpers
 # ----------------------------
+@lru_cache(maxsize=512)
 def _norm_key(k: str) -> str:
     return "_".join(str(k).strip().upper().split())
 
+def _to_float(v: Any) -> float:
+    """Amount as float, NaN if unparsable; strings parse like pd.to_numeric."""
+    if isinstance(v, str):
+        # same parser as the batch path: float() would also take "1_000",
+        # non-ASCII digits/spaces and overflowing exponents
+        return float(pd.to_numeric(np.array([v], dtype=object), errors="coerce")[0])
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return np.nan
+
+@njit(cache=True, error_model="numpy")
+def _engineer_row(vals: np.ndarray, clip_hi: np.ndarray) -> np.ndarray:
+    """Engineered features for one record, laid out as ROW_FEATURES.
+
+    ``vals`` holds the amounts in KNOWN_AMT_COLS order (NaN if missing) and
+    ``clip_hi`` the matching clip caps. NaNs propagate like the NumPy path.
+    """
+    eps = 1e-9
+    n = vals.shape[0]
+    out = np.empty(3 + 4 * n)
+
+    # Ratios (CLAIMED, SYSTEM_CLAIMED, PATIENT_SHARE, BILLED_TAX, ACCEPTED_TAX, GROSS)
+    ratios = (
+        (vals[2] / (vals[0] + eps), 5.0),
+        (vals[4] / (vals[3] + eps), 2.0),
+        (vals[1] / (vals[0] + eps), 5.0),
+    )
+    for i in range(3):
+        r, hi = ratios[i]
+        if r < 0.0:
+            r = 0.0
+        elif r > hi:
+            r = hi
+        out[i] = r
+
+    # Amount features
+    for i in range(n):
+        v = vals[i]
+        hi = clip_hi[i]
+        clip_val = v
+        log_in = 0.0 if v < 0.0 else v
+        if not math.isnan(hi):
+            if clip_val > hi:
+                clip_val = hi
+            if log_in > hi:
+                log_in = hi
+        out[3 + i] = clip_val
+        out[3 + n + i] = math.log1p(log_in)
+        out[3 + 2 * n + i] = 1.0 if v < 0.0 else 0.0
+        out[3 + 3 * n + i] = 1.0 if v == 0.0 else 0.0
+    return out
+
+# compile at import so the first request doesn't pay the JIT cost
+_engineer_row(np.zeros(len(KNOWN_AMT_COLS)), np.full(len(KNOWN_AMT_COLS), np.nan))
+
+def _engineer_record(rec: Dict[str, Any]) -> Dict[str, Any]:
+    """Single-record counterpart of _apply_engineering_to_frame."""
+    vals = np.array([_to_float(rec.get(c)) for c in KNOWN_AMT_COLS], dtype=np.float64)
+    feats = _engineer_row(vals, CLIP_HI)
+    out = dict(rec)
+    for (name, needs), v in zip(ROW_FEATURES, feats.tolist()):
+        if needs is not None and all(k in rec for k in needs):
+            out[name] = v
+    return out
+
 def _apply_engineering_to_frame(df_like: pd.DataFrame) -> pd.DataFrame:
-    """Recreate engineered features used during training."""
+    """Recreate engineered features used during training.
+
+    Works on raw float64 buffers and attaches all engineered columns with a
+    single ``concat`` (one block-manager merge). ``df_like`` itself is read,
+    never mutated, so callers don't need to copy it.
+    """
     eps = 1e-9
-    df = df_like.copy()
 
-    # Ratios
-    if {"PATIENT_SHARE","CLAIMED_AMOUNT"}.issubset(df.columns):
-        df["PATIENT_SHARE_PCT"] = (df["PATIENT_SHARE"] / (df["CLAIMED_AMOUNT"] + eps)).clip(0, 5.0)
-    if {"ACCEPTED_TAX","BILLED_TAX"}.issubset(df.columns):
-        df["TAX_ACCEPT_RATIO"] = (df["ACCEPTED_TAX"] / (df["BILLED_TAX"] + eps)).clip(0, 2.0)
-    if {"SYSTEM_CLAIMED_AMOUNT","CLAIMED_AMOUNT"}.issubset(df.columns):
-        df["SYSTEM_TO_CLAIMED_RATIO"] = (df["SYSTEM_CLAIMED_AMOUNT"] / (df["CLAIMED_AMOUNT"] + eps)).clip(0, 5.0)
+    # Raw amount buffers (coerced once, reused by ratios + amount features)
+    raw = {
+        c: pd.to_numeric(df_like[c], errors="coerce").to_numpy(dtype=np.float64, copy=False)
+        for c in KNOWN_AMT_COLS if c in df_like.columns
+    }
+    new_cols: Dict[str, np.ndarray] = {}
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Ratios
+        if "PATIENT_SHARE" in raw and "CLAIMED_AMOUNT" in raw:
+            new_cols["PATIENT_SHARE_PCT"] = np.clip(
+                np.divide(raw["PATIENT_SHARE"], raw["CLAIMED_AMOUNT"] + eps), 0, 5.0)
+        if "ACCEPTED_TAX" in raw and "BILLED_TAX" in raw:
+            new_cols["TAX_ACCEPT_RATIO"] = np.clip(
+                np.divide(raw["ACCEPTED_TAX"], raw["BILLED_TAX"] + eps), 0, 2.0)
+        if "SYSTEM_CLAIMED_AMOUNT" in raw and "CLAIMED_AMOUNT" in raw:
+            new_cols["SYSTEM_TO_CLAIMED_RATIO"] = np.clip(
+                np.divide(raw["SYSTEM_CLAIMED_AMOUNT"], raw["CLAIMED_AMOUNT"] + eps), 0, 5.0)
 
     # Amount features
-    for c in amt_for_feats:
-        if c in df.columns:
-            vals = pd.to_numeric(df[c], errors="coerce")
-            if clip_stats and c in clip_stats:
-                hi = float(clip_stats[c])
-                clip_val = np.clip(vals, None, hi)
-                log_val  = np.log1p(np.clip(vals, 0, hi))
-            else:
-                clip_val = vals
-                log_val  = np.log1p(np.clip(vals, 0, None))
+    for c, hi in AMT_FEAT_CAPS:
+        if c in raw:
+            vals = raw[c]
+            clip_val = np.minimum(vals, hi)
+            log_val  = np.clip(vals, 0.0, hi)  # one buffer: clipped, then log1p in place
+            np.log1p(log_val, out=log_val)
+
+            new_cols[f"{c}_CLIP"]      = clip_val
+            new_cols[f"{c}_LOG1P"]     = log_val
+            # flags written straight into float64 (same dtype as _engineer_row);
+            # not np.signbit, which would flag -0.0 unlike training's (s < 0)
+            new_cols[f"{c}_NEG_FLAG"]  = np.less(vals, 0.0, out=np.empty_like(vals))
+            new_cols[f"{c}_ZERO_FLAG"] = np.equal(vals, 0.0, out=np.empty_like(vals))
+
+    eng = pd.DataFrame(new_cols, index=df_like.index)
+    overlap = df_like.columns.intersection(eng.columns)
+    if len(overlap):
+        # payload already carried engineered names: recomputed values win
+        df_like = df_like.drop(columns=overlap)
+    return pd.concat([df_like, eng], axis=1, copy=False)
 
-            df[f"{c}_CLIP"]      = clip_val
-            df[f"{c}_LOG1P"]     = log_val
-            df[f"{c}_NEG_FLAG"]  = (vals < 0).astype("uint8")
-            df[f"{c}_ZERO_FLAG"] = (vals == 0).astype("uint8")
+def _normalize_record(r: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize one JSON object's keys/values to the training column names."""
+    # JSON null -> NaN: the pipeline's imputers only mask NaN, so a None in a
+    # text/categorical column would reach TF-IDF / one-hot as a real value
+    nr = {_norm_key(k): (np.nan if v is None else v) for k, v in r.items()}
+    # alias if training used SRV_DESC
+    for src, dst in KEY_ALIASES.items():
+        if src in nr and dst not in nr:
+            nr[dst] = nr.pop(src)
+    return nr
 
-    return df
+def _record_frame(nr: Dict[str, Any]) -> pd.DataFrame:
+    """1-row BASE_FEATURES frame for a normalized record; absent columns are NaN.
+
+    Engineers with the Numba kernel, fills one float64 and one object array
+    and wraps them with pandas' internal BlockManager (pinned pandas): no
+    per-column arrays, no dtype inference and no consolidation copy.
+    """
+    get = _engineer_record(nr).get
+    num = np.array([get(c, np.nan) for c in ROW_NUM_COLS], dtype=np.float64).reshape(-1, 1)
+    obj = np.empty((len(ROW_OBJ_COLS), 1), dtype=object)
+    for i, c in enumerate(ROW_OBJ_COLS):
+        obj[i, 0] = get(c, np.nan)
+    mgr = BlockManager(
+        (make_block(num, placement=_ROW_NUM_POS, ndim=2), make_block(obj, placement=_ROW_OBJ_POS, ndim=2)),
+        _ROW_AXES,
+        verify_integrity=False,
+    )
+    return pd.DataFrame._from_mgr(mgr, axes=mgr.axes)
 
 def _to_feature_frame(payload: Union[Dict[str, Any], List[Dict[str, Any]]]) -> pd.DataFrame:
-    """Normalize JSON -> DataFrame with BASE_FEATURES, apply engineering."""
+    """Normalize JSON -> DataFrame with BASE_FEATURES, apply engineering.
+
+    Single records go through _record_frame.
+    """
     if isinstance(payload, dict):
         records = [payload]
     elif isinstance(payload, list):
@@ -105,36 +285,125 @@ def _to_feature_frame(payload: Union[Dict[str, Any], List[Dict[str, Any]]]) -> p
     else:
         raise ValueError("Payload must be a JSON object or a list of JSON objects.")
 
-    normed = []
-    for r in records:
-        nr = {_norm_key(k): v for k, v in r.items()}
-        # alias if training used SRV_DESC
-        if "SERVICE_DESC" in nr and "SRV_DESC" in BASE_FEATURES and "SRV_DESC" not in nr:
-            nr["SRV_DESC"] = nr.pop("SERVICE_DESC")
-        normed.append(nr)
+    normed = [_normalize_record(r) for r in records]
 
+    if len(normed) == 1:
+        return _record_frame(normed[0])
+
+    # raw_df is private to this call and handed straight to the engineering step
     raw_df = pd.DataFrame(normed)
     enriched = _apply_engineering_to_frame(raw_df)
 
-    for col in BASE_FEATURES:
-        if col not in enriched.columns:
-            enriched[col] = np.nan
+    # reindex fills every feature the payload didn't supply with NaN
+    return enriched.reindex(columns=BASE_FEATURES_INDEX, copy=False)
+
+# Only created when sharding is enabled; threads start lazily on first submit,
+# i.e. after gunicorn has forked the worker
+EXECUTOR = (
+    ThreadPoolExecutor(max_workers=PREDICT_WORKERS, thread_name_prefix="predict")
+    if PREDICT_WORKERS > 1 else None
+)
 
-    return enriched[BASE_FEATURES].copy()
+def _predict_proba(dfX: pd.DataFrame) -> np.ndarray:
+    """P(approved) per row; large batches are sharded across EXECUTOR.
+
+    Every pipeline step is fitted and row-independent, so per-shard results
+    match the single-call output (up to BLAS summation order, ~1e-17). The
+    GIL is released in the NumPy/SciPy/XGBoost kernels, which is where
+    shards overlap.
+    """
+    n = len(dfX)
+    if EXECUTOR is None or n < PARALLEL_MIN_ROWS:
+        return clf.predict_proba(dfX).take(POS_IDX, axis=1)
+    bounds = np.linspace(0, n, PREDICT_WORKERS + 1, dtype=np.int64)
+    futures = [
+        EXECUTOR.submit(clf.predict_proba, dfX.iloc[a:b])
+        for a, b in zip(bounds[:-1], bounds[1:]) if b > a
+    ]
+    return np.concatenate([f.result().take(POS_IDX, axis=1) for f in futures])
 
 def _predict_df(dfX: pd.DataFrame, threshold: float = None):
     thr = BEST_THR if threshold is None else float(threshold)
-    proba = clf.predict_proba(dfX)[:, 1]
+    proba = _predict_proba(dfX).astype(np.float64, copy=False)
+    decisions = (proba >= thr).astype(np.int8)
+    probas_r = np.round(proba, 6)
+    thr_r = round(thr, 6)
     return [{
-        "proba_approved": round(float(p), 6),
-        "threshold": round(thr, 6),
-        "decision": int(p >= thr)
-    } for p in proba]
+        "proba_approved": p,
+        "threshold": thr_r,
+        "decision": d
+    } for p, d in zip(probas_r.tolist(), decisions.tolist())]
+
+def _predict_record(nr: Dict[str, Any], threshold: float = None):
+    """Fast path for one normalized record: one 1-row frame, no batch engineering."""
+    return _predict_df(_record_frame(nr), threshold=threshold)
+
+def _cache_key(nr: Dict[str, Any]) -> Optional[tuple]:
+    """Hashable key of the values the model reads, or None to bypass the cache.
+
+    Only BASE_FEATURES / KNOWN_AMT_COLS entries count, so junk fields can't
+    grow the cache; records with non-scalar values or more than
+    CACHE_KEY_MAX_CHARS of text are not cached. The value's type is part of
+    the key so e.g. True and 1 don't share an entry.
+    """
+    items = []
+    size = 0
+    for k in sorted(nr):
+        if k not in _CACHE_KEY_COLS:
+            continue
+        v = nr[k]
+        if isinstance(v, str):
+            size += len(v)
+        elif not isinstance(v, (int, float)):
+            return None
+        items.append((k, type(v), v))
+    if size > CACHE_KEY_MAX_CHARS:
+        return None
+    return tuple(items)
+
+@lru_cache(maxsize=4096)
+def _predict_cached(key: tuple, threshold: float) -> tuple:
+    """Memoised single-record prediction, keyed by _cache_key.
+
+    Returns a tuple so callers can't grow the cached entry; copy the dicts
+    before adding per-response fields.
+    """
+    return tuple(_predict_record({k: v for k, _, v in key}, threshold=threshold))
+
+# ----------------------------
+# Warm-up
+# ----------------------------
+# Run one synthetic row (zero amounts, everything else NaN) through the single
+# and batch paths so lazy imports / BLAS init happen at boot, not on request #1.
+_WARMUP_ROW = {c: 0.0 for c in KNOWN_AMT_COLS}
+try:
+    _predict_df(_to_feature_frame(_WARMUP_ROW))
+    _predict_df(_to_feature_frame([_WARMUP_ROW, _WARMUP_ROW]))
+except Exception:
+    pass  # warm-up is best-effort; real requests report their own errors
 
 # ----------------------------
 # Flask app
 # ----------------------------
 app = Flask(__name__)
+# Upper bound on /predict bodies (bytes); larger requests get a 413
+app.config["MAX_JSON_BYTES"] = int(os.environ.get("MAX_JSON_BYTES", "4000000"))
+
+def _json_response(obj: Any, status: int = 200):
+    """orjson-backed stand-in for jsonify (no str round-trip on encode)."""
+    return app.response_class(orjson.dumps(obj), status=status, mimetype="application/json")
+
+def _read_body(limit: int) -> Optional[bytearray]:
+    """Raw request body straight from the WSGI stream, or None if over ``limit`` bytes."""
+    if request.content_length is not None and request.content_length > limit:
+        return None
+    buf = bytearray()
+    while len(buf) <= limit:
+        chunk = request.stream.read(limit + 1 - len(buf))
+        if not chunk:
+            break
+        buf += chunk
+    return None if len(buf) > limit else buf
 
 @app.route("/", methods=["GET"])
 def index():
@@ -152,20 +421,21 @@ def health():
         "clip_stats_loaded": bool(clip_stats)
     })
 
+# META is read once at import, so the /metadata body never changes
+_METADATA_BYTES = orjson.dumps({
+    "base_features": BASE_FEATURES,
+    "text_cols": TEXT_COLS,
+    "cat_cols": CAT_COLS,
+    "num_cols": NUM_COLS,
+    "library_versions": META.get("library_versions", {})
+})
+
 @app.route("/metadata", methods=["GET"])
 def metadata():
-    return jsonify({
-        "base_features": BASE_FEATURES,
-        "text_cols": TEXT_COLS,
-        "cat_cols": CAT_COLS,
-        "num_cols": NUM_COLS,
-        "library_versions": META.get("library_versions", {})
-    })
+    return app.response_class(_METADATA_BYTES, mimetype="application/json")
 
-# UI form
-@app.route("/web", methods=["GET"])
-def web_ui():
-    return """<!doctype html>
+# UI form (encoded once at import; served as static bytes)
+_WEB_UI_HTML = """<!doctype html>
 <html>
   <head>
     <meta charset="utf-8"><title>Claims Predictor</title>
@@ -239,19 +509,34 @@ def web_ui():
     </script>
   </body>
 </html>"""
+_WEB_UI_BYTES = _WEB_UI_HTML.encode("utf-8")
+
+@app.route("/web", methods=["GET"])
+def web_ui():
+    return app.response_class(_WEB_UI_BYTES, mimetype="text/html")
 
 @app.route("/predict", methods=["POST"])
 def predict():
     try:
-        payload = request.get_json(force=True)
+        raw = _read_body(app.config["MAX_JSON_BYTES"])
+        if raw is None:
+            return _json_response({"ok": False, "error": "Payload too large."}, status=413)
+        payload = orjson.loads(raw)
         thr = request.args.get("threshold", default=None, type=float)
-        X = _to_feature_frame(payload)
-        preds = _predict_df(X, threshold=thr)
-        for i, p in enumerate(preds):
-            p["row_id"] = i
-        return jsonify({"ok": True, "n": len(preds), "predictions": preds})
+        if isinstance(payload, dict):
+            nr = _normalize_record(payload)
+            key = _cache_key(nr)
+            if key is None:
+                preds = _predict_record(nr, threshold=thr)
+            else:
+                preds = _predict_cached(key, BEST_THR if thr is None else thr)
+        else:
+            X = _to_feature_frame(payload)
+            preds = _predict_df(X, threshold=thr)
+        preds = [dict(p, row_id=i) for i, p in enumerate(preds)]
+        return _json_response({"ok": True, "n": len(preds), "predictions": preds})
     except Exception as e:
-        return jsonify({"ok": False, "error": str(e)}), 400
+        return _json_response({"ok": False, "error": str(e)}, status=400)
 
 # ----------------------------
 # Run
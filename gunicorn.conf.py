@@ -1,6 +1,16 @@
 # Bind is set via start.sh to respect $PORT
-workers = 2          # tune per Space CPU/RAM
-threads = 4
+# One preloaded process: app.py (pipeline, caches, warm-up) is imported once in
+# the master before forking, so the worker starts hot and pages stay CoW-shared.
+preload_app = True
+worker_class = "gthread"
+workers = 1          # tune per Space CPU/RAM
+# predict_proba spends its time in NumPy/SciPy/XGBoost C code that releases
+# the GIL, so extra threads scale inference concurrency without extra copies
+# of the pipeline.
+# app.py's batch sharding pool (PREDICT_WORKERS) is off by default, so these
+# threads only serve requests. If PREDICT_WORKERS is raised, its shards run
+# on top of these threads and XGBoost's own OpenMP threads; size both together.
+threads = 8
 timeout = 120
 graceful_timeout = 30
 keepalive = 5
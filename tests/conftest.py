@@ -0,0 +1,159 @@
+"""Shared fixtures: app.py imported against throwaway artifacts.
+
+app.py loads its artifacts at import time, so ``make_app`` writes a tiny
+ARTIFACTS_DIR and executes app.py as a fresh module each time. ``api`` is
+one such module serving a small fitted pipeline with the notebook's
+preprocessing (imputed numerics, one-hot categoricals, TF-IDF text) in
+front of a LogisticRegression.
+"""
+import atexit
+import importlib.util
+import itertools
+import json
+import os
+import pathlib
+import shutil
+import sys
+import tempfile
+
+# The Numba kernel is compiled with cache=True. Test copies of app.py run
+# under their own module names, which a plain `import app` can't resolve
+# from the cache, so keep their cache out of the repo's __pycache__.
+# (Must be set before numba is first imported.)
+_NUMBA_CACHE = tempfile.mkdtemp(prefix="numba-cache-")
+os.environ["NUMBA_CACHE_DIR"] = _NUMBA_CACHE
+atexit.register(shutil.rmtree, _NUMBA_CACHE, True)
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.dummy import DummyClassifier
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import FunctionTransformer, OneHotEncoder, StandardScaler
+
+APP_PATH = pathlib.Path(__file__).resolve().parents[1] / "app.py"
+
+AMT = [
+    "CLAIMED_AMOUNT", "SYSTEM_CLAIMED_AMOUNT", "PATIENT_SHARE",
+    "BILLED_TAX", "ACCEPTED_TAX", "GROSS_CLAIMED_AMOUNT",
+]
+ENGINEERED = ["PATIENT_SHARE_PCT", "TAX_ACCEPT_RATIO", "SYSTEM_TO_CLAIMED_RATIO"] + [
+    f"{c}{s}" for c in AMT for s in ("_CLIP", "_LOG1P", "_NEG_FLAG", "_ZERO_FLAG")
+]
+CAT = ["COUNTRY", "INSURER"]
+TEXT = ["DIAGNOSIS_DESCRIPTION", "SRV_DESC"]
+NUM = AMT + ENGINEERED
+
+# A complete record for the fitted pipeline (payload keys, before aliasing)
+RECORD = {
+    "CLAIMED_AMOUNT": 560, "SYSTEM_CLAIMED_AMOUNT": 420, "PATIENT_SHARE": 50,
+    "BILLED_TAX": 10, "ACCEPTED_TAX": 10, "GROSS_CLAIMED_AMOUNT": 610,
+    "COUNTRY": "B", "INSURER": "B",
+    "DIAGNOSIS_DESCRIPTION": "routine check up", "SERVICE_DESC": "consultation",
+}
+
+_names = itertools.count()
+
+
+def _load_app(art: pathlib.Path, clip_stats, pipeline):
+    meta = {"base_features": CAT + NUM + TEXT, "text_cols": TEXT, "cat_cols": CAT, "num_cols": NUM}
+    (art / "metadata.json").write_text(json.dumps(meta))
+    (art / "threshold.json").write_text(json.dumps({"threshold": 0.5}))
+    if clip_stats is not None:
+        (art / "clip_stats.json").write_text(json.dumps(clip_stats))
+    joblib.dump(pipeline, art / "claim_approval_pipeline.joblib")
+
+    name = f"app_under_test_{next(_names)}"
+    mp = pytest.MonkeyPatch()
+    mp.setenv("ARTIFACTS_DIR", str(art))
+    try:
+        spec = importlib.util.spec_from_file_location(name, APP_PATH)
+        module = importlib.util.module_from_spec(spec)
+        # registered so Numba can resolve the module when reloading its cache
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    finally:
+        mp.undo()
+    return module
+
+
+def flatten_1d(X):
+    return np.asarray(X).reshape(-1)
+
+# Pickled as __main__.flatten_1d, like the notebook's artifact, so loading
+# it goes through app.py's unpickler shim
+flatten_1d.__module__ = "__main__"
+
+
+def _fit_pipeline(engineer):
+    """Fit on random claims; ``engineer`` turns records into feature frames."""
+    rng = np.random.default_rng(0)
+    n = 600
+    records = pd.DataFrame({c: rng.gamma(2.0, 300.0, n).round(2) for c in AMT})
+    records["SYSTEM_CLAIMED_AMOUNT"] = (records["CLAIMED_AMOUNT"] * rng.uniform(0.5, 1.1, n)).round(2)
+    for c in CAT:
+        records[c] = rng.choice(["A", "B", "C"], n)
+    records["DIAGNOSIS_DESCRIPTION"] = rng.choice(["routine check up", "complex surgery", "flu"], n)
+    records["SERVICE_DESC"] = rng.choice(["consultation", "major operation", "lab"], n)
+    X = engineer(records.to_dict("records"))
+    y = (
+        2 * X["SYSTEM_TO_CLAIMED_RATIO"] + (X["COUNTRY"] == "A") - (X["INSURER"] == "C")
+        - X["DIAGNOSIS_DESCRIPTION"].str.contains("surgery") + rng.normal(0, 1.0, n) > 1.5
+    ).astype(int)
+
+    steps = [
+        ("num", Pipeline([
+            ("imputer", SimpleImputer(strategy="median")),
+            ("scale", StandardScaler()),
+        ]), NUM),
+        ("cat", Pipeline([
+            ("imputer", SimpleImputer(strategy="most_frequent")),
+            ("ohe", OneHotEncoder(handle_unknown="ignore")),
+        ]), CAT),
+    ]
+    for t in TEXT:
+        steps.append((f"text_{t}", Pipeline([
+            ("imputer", SimpleImputer(strategy="constant", fill_value="")),
+            ("flatten", FunctionTransformer(flatten_1d)),
+            ("tfidf", TfidfVectorizer()),
+        ]), [t]))
+    pipe = Pipeline([
+        ("pre", ColumnTransformer(steps, remainder="drop")),
+        ("model", LogisticRegression(max_iter=2000)),
+    ])
+    return pipe.fit(X, y)
+
+
+@pytest.fixture(scope="session")
+def make_app(tmp_path_factory):
+    """Factory: make_app(clip_stats=None, pipeline=None) -> freshly imported app module.
+
+    Without a pipeline, a DummyClassifier stands in (enough for code that
+    never reaches the model).
+    """
+    def make(clip_stats=None, pipeline=None):
+        if pipeline is None:
+            pipeline = DummyClassifier().fit([[0], [1]], [0, 1])
+        return _load_app(tmp_path_factory.mktemp("artifacts"), clip_stats, pipeline)
+    return make
+
+
+@pytest.fixture(scope="session")
+def api(make_app):
+    """app.py serving a fitted pipeline, with clip stats."""
+    clip_stats = {c: 5000.0 for c in AMT}
+    # training features come from app.py's own batch engineering
+    pipeline = _fit_pipeline(make_app(clip_stats=clip_stats)._to_feature_frame)
+    # pickle saves flatten_1d by reference; app.py repoints it on import
+    sys.modules["__main__"].flatten_1d = flatten_1d
+    return make_app(clip_stats=clip_stats, pipeline=pipeline)
+
+
+@pytest.fixture
+def client(api):
+    return api.app.test_client()
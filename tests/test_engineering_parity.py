@@ -0,0 +1,89 @@
+"""Single-record (Numba) vs batch (NumPy) feature engineering parity.
+
+app.py engineers a one-object payload with ``_engineer_row`` and a list
+payload with ``_apply_engineering_to_frame``. Both must produce the same
+model inputs, so every record here is run through both paths and the
+engineered columns are compared.
+
+Runs against throwaway artifacts (see conftest.py; engineering never
+reaches the model):
+
+    python -m pytest -q tests
+"""
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import AMT, ENGINEERED
+
+# GROSS_CLAIMED_AMOUNT is left uncapped so capped and uncapped amounts mix
+CLIP_STATS = {c: 1000.0 for c in AMT if c != "GROSS_CLAIMED_AMOUNT"}
+
+BASE = {"COUNTRY": "A", "INSURER": "B", "DIAGNOSIS_DESCRIPTION": "flu", "SERVICE_DESC": "lab"}
+
+CASES = {
+    "typical": {"CLAIMED_AMOUNT": 500, "SYSTEM_CLAIMED_AMOUNT": 450, "PATIENT_SHARE": 50,
+                "BILLED_TAX": 25, "ACCEPTED_TAX": 20, "GROSS_CLAIMED_AMOUNT": 525},
+    "no_amounts": {},
+    "missing_some": {"CLAIMED_AMOUNT": 500, "ACCEPTED_TAX": 20},
+    "null_amounts": {c: None for c in AMT},
+    "nan_amounts": {c: math.nan for c in AMT},
+    "zeros": {c: 0 for c in AMT},
+    "negative_zeros": {c: -0.0 for c in AMT},
+    "zero_denominators": {"CLAIMED_AMOUNT": 0.0, "SYSTEM_CLAIMED_AMOUNT": 10,
+                          "PATIENT_SHARE": 5, "BILLED_TAX": -0.0, "ACCEPTED_TAX": 3},
+    "negatives": {"CLAIMED_AMOUNT": -100, "SYSTEM_CLAIMED_AMOUNT": -50, "PATIENT_SHARE": -1e-9,
+                  "BILLED_TAX": -3, "ACCEPTED_TAX": 2, "GROSS_CLAIMED_AMOUNT": -7.5},
+    "above_cap": {c: 1e12 for c in AMT},
+    "at_cap": {c: 1000.0 for c in AMT},
+    "ratio_caps": {"CLAIMED_AMOUNT": 1, "SYSTEM_CLAIMED_AMOUNT": 1e6, "PATIENT_SHARE": 1e6,
+                   "BILLED_TAX": 1, "ACCEPTED_TAX": 1e6},
+    "numeric_strings": {"CLAIMED_AMOUNT": "500", "PATIENT_SHARE": " 12.5 ", "BILLED_TAX": "-0"},
+    # float() accepts these, pd.to_numeric doesn't: both paths must see NaN
+    "float_only_strings": {"CLAIMED_AMOUNT": "1_000", "SYSTEM_CLAIMED_AMOUNT": "１２３",
+                           "PATIENT_SHARE": "\xa05", "BILLED_TAX": "1e400", "ACCEPTED_TAX": "٣"},
+}
+
+
+@pytest.fixture(scope="module", params=["clip_stats", "no_clip_stats"])
+def app(request, make_app):
+    return make_app(clip_stats=CLIP_STATS if request.param == "clip_stats" else None)
+
+
+@pytest.mark.parametrize("amounts", CASES.values(), ids=CASES.keys())
+def test_single_matches_batch(app, amounts):
+    rec = {**BASE, **amounts}
+    single = app._to_feature_frame(rec)
+    # Companion row: same keys (a key absent from the whole batch has no
+    # column, unlike a NaN in a present one), different values, so the
+    # batch path doesn't see uniform columns
+    other = {k: CASES["typical"].get(k, v) for k, v in rec.items()}
+    batch = app._to_feature_frame([rec, other]).iloc[[0]]
+
+    assert list(single.columns) == list(batch.columns)
+    # NaN positions must match exactly; values to a few ULP, since the kernel's
+    # math.log1p (libm) and np.log1p can differ in the last bit
+    pd.testing.assert_frame_equal(
+        single[ENGINEERED].astype(np.float64).reset_index(drop=True),
+        batch[ENGINEERED].astype(np.float64).reset_index(drop=True),
+        check_exact=False, rtol=1e-12, atol=0.0,
+    )
+
+
+def test_caps_are_applied(app):
+    single = app._to_feature_frame({**BASE, **CASES["above_cap"]})
+    capped = app.clip_stats is not None
+    assert single.at[0, "CLAIMED_AMOUNT_CLIP"] == (1000.0 if capped else 1e12)
+    assert single.at[0, "GROSS_CLAIMED_AMOUNT_CLIP"] == 1e12
+    assert single.at[0, "PATIENT_SHARE_PCT"] == 1.0
+
+
+def test_negative_zero_is_zero_not_negative(app):
+    # training flagged with (s < 0) / (s == 0): -0.0 counts as zero only
+    rec = {**BASE, **CASES["negative_zeros"]}
+    for frame in (app._to_feature_frame(rec), app._to_feature_frame([rec, rec])):
+        assert (frame["CLAIMED_AMOUNT_NEG_FLAG"] == 0.0).all()
+        assert (frame["CLAIMED_AMOUNT_ZERO_FLAG"] == 1.0).all()
+        assert (frame["CLAIMED_AMOUNT_LOG1P"] == 0.0).all()
@@ -0,0 +1,45 @@
+"""JSON null is treated as a missing field (_normalize_record).
+
+The pipeline's imputers only mask NaN: a raw None used to fail TF-IDF
+(a 400) or be one-hot encoded as its own category. A null field must give
+the same frame and the same prediction as leaving the field out.
+"""
+import json
+
+import pandas as pd
+import pytest
+
+from conftest import RECORD
+
+FIELDS = ["COUNTRY", "DIAGNOSIS_DESCRIPTION", "SERVICE_DESC"]  # cat, text, aliased text
+
+
+def _without(rec, field):
+    return {k: v for k, v in rec.items() if k != field}
+
+
+def _assert_same_frame(a, b):
+    pd.testing.assert_frame_equal(a, b)
+    # assert_frame_equal treats None and NaN alike; the imputers don't
+    assert a.map(type).equals(b.map(type))
+
+
+def _predict(client, payload):
+    r = client.post("/predict", data=json.dumps(payload), content_type="application/json")
+    assert r.status_code == 200, r.get_json()
+    return r.get_json()["predictions"]
+
+
+@pytest.mark.parametrize("field", FIELDS)
+def test_null_frame_matches_absent(api, field):
+    null, absent = {**RECORD, field: None}, _without(RECORD, field)
+    _assert_same_frame(api._to_feature_frame(null), api._to_feature_frame(absent))
+    # batch: the other row supplies the field, so absent means NaN there too
+    _assert_same_frame(api._to_feature_frame([null, RECORD]), api._to_feature_frame([absent, RECORD]))
+
+
+@pytest.mark.parametrize("field", FIELDS)
+def test_null_prediction_matches_absent(client, field):
+    null, absent = {**RECORD, field: None}, _without(RECORD, field)
+    assert _predict(client, null) == _predict(client, absent)
+    assert _predict(client, [null, RECORD]) == _predict(client, [absent, RECORD])
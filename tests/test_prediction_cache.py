@@ -0,0 +1,97 @@
+"""Single-record prediction cache (_cache_key / _predict_cached) via /predict.
+
+Only the values the model reads make up a key, so junk fields can't grow
+the cache; oversize or non-scalar records bypass it. A cached answer must
+match the uncached one (a one-element list never touches the cache).
+"""
+import json
+
+import pytest
+
+from conftest import RECORD
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(api):
+    api._predict_cached.cache_clear()
+
+
+def _post(client, payload, query=""):
+    return client.post("/predict" + query, data=json.dumps(payload), content_type="application/json")
+
+
+def _predictions(client, payload, query=""):
+    r = _post(client, payload, query)
+    assert r.status_code == 200, r.get_json()
+    return r.get_json()["predictions"]
+
+
+def _cache(api):
+    info = api._predict_cached.cache_info()
+    return info.hits, info.misses, info.currsize
+
+
+def test_repeat_is_a_hit_and_matches_uncached(api, client):
+    first = _predictions(client, RECORD)
+    second = _predictions(client, RECORD)
+    assert _cache(api) == (1, 1, 1)
+    assert first == second == _predictions(client, [RECORD])
+
+
+def test_fields_the_model_ignores_share_one_entry(api, client):
+    preds = [
+        _predictions(client, {**RECORD, "REQUEST_ID": i, f"NOTE_{i}": "x" * 1000})
+        for i in range(5)
+    ]
+    assert _cache(api) == (4, 1, 1)
+    assert all(p == preds[0] for p in preds)
+
+
+def test_model_inputs_change_the_key(api, client):
+    a = _predictions(client, RECORD)
+    b = _predictions(client, {**RECORD, "COUNTRY": "C", "CLAIMED_AMOUNT": 100})
+    assert _cache(api) == (0, 2, 2)
+    assert a != b
+
+
+def test_oversize_text_bypasses_cache(api, client):
+    rec = {**RECORD, "DIAGNOSIS_DESCRIPTION": "flu " * (api.CACHE_KEY_MAX_CHARS // 4 + 1)}
+    first = _predictions(client, rec)
+    assert _predictions(client, rec) == first == _predictions(client, [rec])
+    assert _cache(api) == (0, 0, 0)
+
+
+@pytest.mark.parametrize("field, value", [
+    ("COUNTRY", ["A"]),
+    ("DIAGNOSIS_DESCRIPTION", {"text": "flu"}),
+    ("CLAIMED_AMOUNT", [560]),
+])
+def test_non_scalar_values_bypass_cache(api, client, field, value):
+    rec = {**RECORD, field: value}
+    r = _post(client, rec)
+    # same answer as the uncached path (here the pipeline's own error)
+    uncached = _post(client, [rec])
+    assert (r.status_code, r.get_json()) == (uncached.status_code, uncached.get_json())
+    assert _cache(api) == (0, 0, 0)
+
+
+def test_value_type_is_part_of_the_key(api, client):
+    # True, 1 and 1.0 are equal (and hash equal) in Python, but stay separate
+    for v in (1, True, 1.0):
+        _predictions(client, {**RECORD, "PATIENT_SHARE": v})
+    assert _cache(api) == (0, 3, 3)
+
+
+def test_threshold_is_part_of_the_key(api, client):
+    low = _predictions(client, RECORD, "?threshold=0")[0]
+    high = _predictions(client, RECORD, "?threshold=1")[0]
+    assert _cache(api) == (0, 2, 2)
+    assert (low["threshold"], low["decision"]) == (0.0, 1)
+    assert (high["threshold"], high["decision"]) == (1.0, 0)
+    assert low["proba_approved"] == high["proba_approved"]
+
+    # no threshold means BEST_THR, so an explicit BEST_THR is the same entry
+    _predictions(client, RECORD)
+    _predictions(client, RECORD, f"?threshold={api.BEST_THR}")
+    assert _cache(api) == (1, 3, 3)
+
@@ -0,0 +1,52 @@
+"""/predict body size cap (_read_body, MAX_JSON_BYTES).
+
+The cap is inclusive: a body of exactly MAX_JSON_BYTES is accepted, one
+byte more is a 413. It applies both to a declared Content-Length and to a
+stream without one (read until EOF).
+"""
+import io
+import json
+
+import pytest
+
+from conftest import RECORD
+
+BODY = json.dumps(RECORD).encode()
+
+
+@pytest.fixture(autouse=True)
+def limit(api, monkeypatch):
+    monkeypatch.setitem(api.app.config, "MAX_JSON_BYTES", len(BODY))
+    return len(BODY)
+
+
+def _declared(client, data, **kw):
+    return client.post("/predict", data=data, content_type="application/json", **kw)
+
+
+def _streamed(client, data):
+    # no Content-Length: the body is only known once the stream hits EOF
+    return client.post(
+        "/predict", input_stream=io.BytesIO(data), content_type="application/json",
+        environ_overrides={"CONTENT_LENGTH": "", "wsgi.input_terminated": True},
+    )
+
+
+@pytest.mark.parametrize("send", [_declared, _streamed], ids=["declared", "streamed"])
+def test_body_at_limit_is_accepted(client, send):
+    r = send(client, BODY)
+    assert r.status_code == 200, r.get_json()
+    assert r.get_json()["n"] == 1
+
+
+@pytest.mark.parametrize("send", [_declared, _streamed], ids=["declared", "streamed"])
+def test_body_one_byte_over_is_rejected(client, send):
+    r = send(client, BODY + b" ")
+    assert r.status_code == 413
+    assert r.get_json() == {"ok": False, "error": "Payload too large."}
+
+
+def test_declared_length_over_limit_is_rejected_unread(client, limit):
+    # the header alone decides; the (small) body is never read
+    r = _declared(client, b"{}", environ_overrides={"CONTENT_LENGTH": str(limit + 1)})
+    assert r.status_code == 413